@@ -0,0 +1,50 @@
+// Zerynth - libs - sitronix-st7735/csrc/st7735_glyph.c
+//
+// Glyph rasterizer for ST7735 text rendering
+//
+
+#include "zerynth.h"
+
+// Expands a 1 bit per pixel glyph into RGB565 pixels inside a bytearray.
+// Glyph rows are stored in (width + 7) >> 3 bytes, least significant bit first.
+C_NATIVE(_st7735_blit_glyph){
+    NATIVE_UNWARN();
+    uint8_t *font;
+    uint8_t *dst;
+    uint8_t *src;
+    uint8_t *out;
+    int32_t font_len, dst_len;
+    int32_t offset, width, height;
+    int32_t fg_hi, fg_lo, bg_hi, bg_lo;
+    int32_t stride, dx, dy;
+    int32_t row, col, row_bytes;
+
+    if (parse_py_args("siiiiiiisiii", nargs, args,
+            &font, &font_len, &offset, &width, &height,
+            &fg_hi, &fg_lo, &bg_hi, &bg_lo,
+            &dst, &dst_len, &stride, &dx, &dy) != 12)
+        return ERR_TYPE_EXC;
+
+    row_bytes = (width + 7) >> 3;
+    if (width < 0 || height < 0 || offset < 0 || offset + row_bytes * height > font_len)
+        return ERR_INDEX_EXC;
+    if (height > 0 && (dx < 0 || dy < 0 || (dy + height - 1) * stride + (dx + width) * 2 > dst_len))
+        return ERR_INDEX_EXC;
+
+    for (row = 0; row < height; row++) {
+        src = font + offset + row * row_bytes;
+        out = dst + (dy + row) * stride + dx * 2;
+        for (col = 0; col < width; col++) {
+            if (src[col >> 3] & (1 << (col & 7))) {
+                *out++ = fg_hi;
+                *out++ = fg_lo;
+            } else {
+                *out++ = bg_hi;
+                *out++ = bg_lo;
+            }
+        }
+    }
+
+    *res = MAKE_NONE();
+    return ERR_OK;
+}
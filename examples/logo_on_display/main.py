@@ -15,7 +15,7 @@ streams.serial()
 try:
     # Setup sensor 
     print("start...")
-    display = st7735.ST7735(SPI0, D5, D23, bl=D27, rst=D26)
+    display = st7735.ST7735(SPI0, D5, D23, bl=D27, rst=D26, clock=40000000)
     print("Ready!")
     print("--------------------------------------------------------")
 except Exception as e:
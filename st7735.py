@@ -50,6 +50,10 @@ ST7735_RAMRD = 0x2E
 ST7735_PTLAR = 0x30
 ST7735_COLMOD = 0x3A
 
+# Color mode data
+ST7735_COLMOD_12BIT = 0x03
+ST7735_COLMOD_16BIT = 0x05
+
 # Rotation cmd
 ST7735_MADCTL = 0x36
 # Rotation data
@@ -94,6 +98,41 @@ ST7735_MAGENTA = 0xF81F  # 0b 11111 000000 11111
 ST7735_YELLOW = 0xFFE0  # 0b 11111 111111 00000
 ST7735_WHITE = 0xFFFF  # 0b 11111 111111 11111
 
+# Display init sequence, as (command, parameters, delay in ms after the command).
+# Rotation and color mode are set between _INIT_SEQ and _INIT_SEQ_END.
+_INIT_SEQ = (
+    (ST7735_SWRESET, b'', 150), # Software reset
+    (ST7735_SLPOUT, b'', 500), # Out of sleep mode
+    # Frame rate ctrl, Rate = fosc/(1x2+40) * (LINE+2C+2D)
+    (ST7735_FRMCTR1, b'\x01\x2C\x2D', 0),
+    (ST7735_FRMCTR2, b'\x01\x2C\x2D', 0),
+    (ST7735_FRMCTR3, b'\x01\x2C\x2D\x01\x2C\x2D', 0),
+    (ST7735_INVCTR, b'\x07', 0), # Display inversion ctrl, No inversion
+    # Power control
+    (ST7735_PWCTR1, b'\xA2\x02\x84', 0), # GVDD = 4.7V, 1.0uA
+    (ST7735_PWCTR2, b'\xC5', 0), # VGH25 = 2.4C VGSEL = -10 VGH = 3 * AVDD
+    (ST7735_PWCTR3, b'\x0A\x00', 0),
+    (ST7735_PWCTR4, b'\x8A\x2A', 0),
+    (ST7735_PWCTR5, b'\x8A\xEE', 0),
+    (ST7735_VMCTR1, b'\x0E', 0),
+    (ST7735_INVON, b'', 0), # Invert display
+)
+
+_INIT_SEQ_END = (
+    (ST7735_CASET, b'\x00\x00\x00\x7F', 0), # Column addr set, XSTART = 0, XEND = 127
+    (ST7735_RASET, b'\x00\x00\x00\x9F', 0), # Row addr set, YSTART = 0, YEND = 159
+    # Set Gamma
+    (ST7735_GMCTRP1, b'\x2C\x1C\x07\x12\x37\x32\x29\x2D\x29\x25\x2B\x39\x00\x01\x03\x10', 0),
+    (ST7735_NORON, b'', 10), # Normal display on
+    (ST7735_DISPON, b'', 100), # Display on
+)
+
+# Pixels sent per SPI write when filling an area with a single color
+ST7735_FILL_CHUNK = 256
+
+# Max number of glyphs rendered by the Python rasterizer kept for reuse by draw_text
+ST7735_GLYPH_CACHE = 32
+
 OLED_TEXT_ALIGN_NONE    = 0
 OLED_TEXT_ALIGN_LEFT    = 0x1
 OLED_TEXT_ALIGN_RIGHT   = 0x2
@@ -112,6 +151,10 @@ OLED_TEXT_ALIGN = [
     OLED_TEXT_VALIGN_CENTER
 ]
 
+@c_native("_st7735_blit_glyph", ["csrc/st7735_glyph.c"], [])
+def _blit_glyph(font, offset, width, height, fg_hi, fg_lo, bg_hi, bg_lo, dst, stride, dx, dy):
+    pass
+
 class ST7735(spi.Spi):
     """
     
@@ -119,7 +162,7 @@ class ST7735(spi.Spi):
  ST7735 class
 ===============
 
-.. class:: ST7735(drv, cs, dc, bl=None, rst=None, clock=27000000)
+.. class:: ST7735(drv, cs, dc, bl=None, rst=None, clock=27000000, framebuffer=False, color_depth=16, native_glyphs=True)
 
     Creates an intance of a new ST7735.
 
@@ -128,7 +171,25 @@ class ST7735(spi.Spi):
     :param dc: Data Control Pin
     :param bl: Backlight Pin
     :param rst: Reset Pin
-    :param clock: Clock speed, default 100kHz
+    :param clock: Clock speed, default 27MHz
+    :param framebuffer: if True, drawing methods write to a RAM framebuffer that is sent to the display by :meth:`show` or :meth:`show_rect` (default False)
+    :param color_depth: bits per pixel used for solid fills, 16 (RGB565) or 12 (RGB444), default 16
+    :param native_glyphs: if True, text glyphs are rendered by the C helper in ``csrc/st7735_glyph.c``, otherwise in Python (default True). The C helper is compiled in both cases.
+
+    .. note :: The SPI clock bounds the speed of every drawing operation, since fills, images and text are all streamed to the display.
+               The ST7735 datasheet specifies 15MHz, but most modules work reliably at 40MHz or more: pass a higher ``clock`` (e.g. ``clock=40000000``) if your board and wiring allow it.
+
+               Make sure ``drv`` selects a hardware SPI peripheral: a software (bit-banged) SPI is roughly 20 times slower regardless of the ``clock`` value.
+
+    .. note :: In framebuffer mode every drawing method only updates a RAM copy of the screen (80x160x2 bytes), so many primitives can be combined in a single transfer.
+               Call :meth:`show` to send the area modified since the last call, or :meth:`show_rect` to send a given area.
+               :meth:`set_rotation` clears the framebuffer to black and marks the whole screen as modified.
+
+    .. note :: Colors are lists or tuples of red, green and blue components (0-255), e.g. ``[255,0,0]``.
+               A color can also be given as 2 bytes already in RGB565 format, e.g. ``b'\\xF8\\x00'``, to skip the conversion when the same color is used many times.
+
+    .. note :: With ``color_depth=12`` the solid fills of :meth:`fill_screen`, :meth:`fill_rect`, :meth:`draw_line` and :meth:`draw_pixel` send two pixels every 3 bytes, 25% less data than RGB565.
+               Text, framebuffer and images (unless drawn with ``pixel_format=12``) are still sent as RGB565: the driver switches the color mode of the display when needed.
 
     Example: ::
 
@@ -136,7 +197,7 @@ class ST7735(spi.Spi):
 
         ...
 
-        display = st7735.ST7735(SPI0, D5, D23, bl=D27, rst=D26)
+        display = st7735.ST7735(SPI0, D5, D23, bl=D27, rst=D26, clock=40000000)
         display.clear()
         display.fill_screen([255,0,0])
         display.fill_rect(10, 20, 20, 100, [255,255,0])
@@ -153,7 +214,10 @@ class ST7735(spi.Spi):
         [ST7735_MAD_MX | ST7735_MAD_MV | ST7735_MAD_BGR, 1, 26, "swap"]
     ]
 
-    def __init__(self, drv, cs, dc, bl=None, rst=None, clock=27000000):
+    def __init__(self, drv, cs, dc, bl=None, rst=None, clock=27000000, framebuffer=False, color_depth=16, native_glyphs=True):
+
+        if color_depth not in [12, 16]:
+            raise ValueError
 
         spi.Spi.__init__(self, cs, drv, clock)
         self.dc = dc
@@ -168,8 +232,27 @@ class ST7735(spi.Spi):
             "buffer": None
         }
         self.buf = bytearray(1)
-        self.s_buf = None
-        self.c_buf = None
+        self._win_buf = bytearray(4)
+        self._px = bytearray(2)
+        self.font = None
+        self._default_font = None
+        self._font_bytes = None
+        self._glyph_w = None
+        self._glyph_off = None
+        self.font_color = None
+        self.background = None
+        # rendered glyphs by (char, font color, background), _glyph_lru holds the keys from least to most recently used
+        self._glyph_cache = {}
+        self._glyph_lru = []
+        self._expand = None
+        self._expand_colors = None
+        self._fb = None
+        self._dirty = None
+        self.color_depth = color_depth
+        self._native_glyphs = native_glyphs
+        self._depth = None
+        if framebuffer:
+            self._fb = bytearray(ST7735_TFTWIDTH*ST7735_TFTHEIGHT*2)
 
         pinMode(self.dc, OUTPUT)
 
@@ -196,99 +279,22 @@ class ST7735(spi.Spi):
     ## @return     nothing
     ##
     def _init(self):
-        
-        self._command(ST7735_SWRESET) # Software reset
-        sleep(150)
-
-        self._command(ST7735_SLPOUT) # Out of sleep mode
-        sleep(500)
 
-        self._command(ST7735_FRMCTR1) # Frame rate ctrl
-        self._data(0x01) # Rate = fosc/(1x2+40) * (LINE+2C+2D)
-        self._data(0x2C)
-        self._data(0x2D)
-        
-        self._command(ST7735_FRMCTR2) # Frame rate ctrl
-        self._data(0x01)
-        self._data(0x2C)
-        self._data(0x2D)
-
-        self._command(ST7735_FRMCTR3) # Frame rate ctrl
-        self._data(0x01)
-        self._data(0x2C)
-        self._data(0x2D)
-        self._data(0x01)
-        self._data(0x2C)
-        self._data(0x2D)
-
-        self._command(ST7735_INVCTR) # Display inversion ctrl
-        self._data(0x07) # No inversion
-
-        self._command(ST7735_PWCTR1) # Power control
-        self._data(0xA2)
-        self._data(0x02) # GVDD = 4.7V
-        self._data(0x84) # 1.0uA
-
-        self._command(ST7735_PWCTR2) # Power control
-        self._data(0xC5) # VGH25 = 2.4C VGSEL = -10 VGH = 3 * AVDD
-
-        self._command(ST7735_PWCTR3) # Power control
-        self._data(0x0A)
-        self._data(0x00)
-
-        self._command(ST7735_PWCTR4) # Power control
-        self._data(0x8A)
-        self._data(0x2A)
-
-        self._command(ST7735_PWCTR5) # Power control
-        self._data(0x8A)
-        self._data(0xEE)
-
-        self._command(ST7735_VMCTR1)
-        self._data(0x0E)
-
-        self.set_invert(1)
+        for cmd, params, delay in _INIT_SEQ:
+            self._cmd_and_params(cmd, params)
+            if delay:
+                sleep(delay)
 
         self.set_rotation()
 
-        self._command(ST7735_COLMOD) # Set color mode
-        self._data(0x05)
-
-        self._command(ST7735_CASET) # Column addr set
-        self._data(0x00) # XSTART = 0
-        self._data(0x00)
-        self._data(0x00)               
-        self._data(0x7F) # XEND = 127
-
-        self._command(ST7735_RASET) # Row addr set
-        self._data(0x00) # YSTART = 0
-        self._data(0x00)
-        self._data(0x00)
-        self._data(0x9F) # YEND = 159
-
-        self._command(ST7735_GMCTRP1) # Set Gamma
-        self._data(0x2C)
-        self._data(0x1C)
-        self._data(0x07)
-        self._data(0x12)
-        self._data(0x37)
-        self._data(0x32)
-        self._data(0x29)
-        self._data(0x2D)
-        self._data(0x29)
-        self._data(0x25)
-        self._data(0x2B)
-        self._data(0x39)
-        self._data(0x00)
-        self._data(0x01)
-        self._data(0x03)
-        self._data(0x10) 
-
-        self._command(ST7735_NORON) # Normal display on
-        sleep(10)
-
-        self._command(ST7735_DISPON) # Display on
-        sleep(100)
+        # Set color mode
+        self._depth = None
+        self._set_depth(self.color_depth)
+
+        for cmd, params, delay in _INIT_SEQ_END:
+            self._cmd_and_params(cmd, params)
+            if delay:
+                sleep(delay)
 
     ##
     ## @brief      Send a command to display.
@@ -305,32 +311,70 @@ class ST7735(spi.Spi):
         self.unselect()
     
     ##
-    ## @brief      Send a data to display.
+    ## @brief      Start a transaction, asserting CS and setting DC once.
     ##
     ## @param      self
-    ## @param      data   is data to send
+    ## @param      data   True to start with data bytes, False to start with a command
     ## @return     nothing
     ##
-    def _data(self, data):
+    def _begin_txn(self, data=False):
         self.select()
-        digitalWrite(self.dc, 1)
-        self.buf[0] = data
-        self.write(self.buf)
-        self.unselect()
-    
+        digitalWrite(self.dc, 1 if data else 0)
+
     ##
-    ## @brief      Send a data as bitearray to display.
+    ## @brief      Switch the current transaction to data bytes, keeping CS asserted.
     ##
     ## @param      self
-    ## @param      data   is data to send
     ## @return     nothing
     ##
-    def _send_data(self, data):
-        self.select()
+    def _begin_data(self):
         digitalWrite(self.dc, 1)
-        self.write(data)
+
+    ##
+    ## @brief      Switch the current transaction to command bytes, keeping CS asserted.
+    ##
+    ## @param      self
+    ## @return     nothing
+    ##
+    def _begin_command(self):
+        digitalWrite(self.dc, 0)
+
+    ##
+    ## @brief      Write bytes inside the current transaction.
+    ##
+    ## @param      self
+    ## @param      buf   is the buffer to write
+    ## @return     nothing
+    ##
+    def _write_raw(self, buf):
+        self.write(buf)
+
+    ##
+    ## @brief      Close the current transaction releasing CS.
+    ##
+    ## @param      self
+    ## @return     nothing
+    ##
+    def _end_txn(self):
         self.unselect()
 
+    ##
+    ## @brief      Send a command followed by its parameters holding CS low.
+    ##
+    ## @param      self
+    ## @param      cmd      is the command to send
+    ## @param      params   is a bytes or bytearray with the command parameters, can be empty
+    ## @return     nothing
+    ##
+    def _cmd_and_params(self, cmd, params):
+        self._begin_txn(data=False)
+        self.buf[0] = cmd
+        self._write_raw(self.buf)
+        if params:
+            self._begin_data()
+            self._write_raw(params)
+        self._end_txn()
+
     def on(self):
         """
 
@@ -377,10 +421,9 @@ class ST7735(spi.Spi):
         if (rotation not in [0, 1, 2, 3]):
             raise ValueError
 
-        self._command(ST7735_MADCTL)
         self.rotation = rotation
         values = self.rotation_settings[self.rotation]
-        self._data(values[0])
+        self._cmd_and_params(ST7735_MADCTL, bytearray([values[0]]))
         self.colstart = values[1]
         self.rowstart = values[2]
         if (values[3] == "swap"):
@@ -390,6 +433,11 @@ class ST7735(spi.Spi):
             self.width = ST7735_TFTWIDTH
             self.height = ST7735_TFTHEIGHT
 
+        if self._fb is not None:
+            # the framebuffer layout follows the rotation: restart from a black screen
+            self._dirty = None
+            self._fb_fill(0, 0, self.width, self.height, b'\x00\x00')
+
     def set_backlight(self, state):
         """
     .. method:: set_backlight(state)
@@ -423,43 +471,117 @@ class ST7735(spi.Spi):
     ## @return     red, green, blue values in a 16-bit 565 RGB value.
     ##
     def _color565(self, color):
-        r = color[0]
-        g = color[1]
-        b = color[2]
+        r, g, b = color
         return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
 
     ##
-    ## @brief      Set the color. 
+    ## @brief      Convert a rgb color to the two bytes sent to the display.
     ##
     ## @param      self
     ## @param      color   is a rgb color
-    ## @return     a list composed by the two byte of the color
+    ## @return     a bytes object composed by the two bytes of the color
+    ##
+    def _color_bytes(self, color):
+        if type(color) == PBYTES:
+            return color
+        c = self._color565(color)
+        return bytes((c >> 8, c & 0xFF))
+
+    ##
+    ## @brief      Check a color and convert it to the two bytes sent to the display.
+    ##
+    ## @param      self
+    ## @param      color   is a rgb list or tuple, or two bytes already in RGB565 format
+    ## @return     a bytes object composed by the two bytes of the color
+    ##
+    def _validate_color(self, color):
+        if type(color) == PBYTES:
+            if len(color) != 2:
+                raise ValueError
+            return color
+        if (type(color) != PLIST and type(color) != PTUPLE) or len(color) != 3:
+            raise ValueError
+        return self._color_bytes(color)
+
+    ##
+    ## @brief      Check a rectangular area and clip it to the display.
+    ##
+    ## @param      self
+    ## @param      x   is the x-coordinate of the area
+    ## @param      y   is the y-coordinate of the area
+    ## @param      w   is the width of the area
+    ## @param      h   is the height of the area
+    ## @return     x, y, w, h of the area inside the display
+    ##
+    def _clamp(self, x, y, w, h):
+        if x < 0 or y < 0 or w < 1 or h < 1:
+            raise ValueError
+        if x > self.width or y > self.height:
+            raise ValueError
+        # coordinates on the border of the display are moved inside it
+        if x == self.width:
+            x = self.width - 1
+        if y == self.height:
+            y = self.height - 1
+        if (x + w) > self.width:
+            w = self.width - x
+        if (y + h) > self.height:
+            h = self.height - y
+        return x, y, w, h
+
+    ##
+    ## @brief      Set the color mode of the display, if not already set.
+    ##
+    ## @param      self
+    ## @param      depth   is the number of bits per pixel, 12 or 16
+    ## @return     nothing
+    ##
+    def _set_depth(self, depth):
+        if self._depth == depth:
+            return
+        self._cmd_and_params(ST7735_COLMOD, bytearray([ST7735_COLMOD_12BIT if depth == 12 else ST7735_COLMOD_16BIT]))
+        self._depth = depth
+
+    ##
+    ## @brief      Pack a color in the 3 bytes holding two 12-bit 444 RGB pixels.
+    ##
+    ## @param      self
+    ## @param      color   is the color as returned by _color_bytes
+    ## @return     a bytes object with two pixels of the color
     ##
-    def _set_color(self, color):
-        color = self._color565(color)
-        d1 = color >> 8
-        d2 = color & 0x00FF
-        return d1, d2
+    def _pack444(self, color):
+        r = color[0] >> 4
+        g = ((color[0] & 0x07) << 1) | (color[1] >> 7)
+        b = (color[1] & 0x1F) >> 1
+        return bytes(((r << 4) | g, (b << 4) | r, (g << 4) | b))
 
     ##
-    ## @brief      Create and send a bytearray buffer.
+    ## @brief      Send npix pixels of the same color, streaming a small chunk buffer.
+    ##
+    ##             Must be called inside the transaction opened by _prepare_keep_open.
     ##
     ## @param      self
-    ## @param      lenght  is the lenght of buffer
-    ## @param      d1      is the first byte of color
-    ## @param      d2      is the second byte of color
+    ## @param      npix    is the number of pixels to send
+    ## @param      color   is the color as returned by _color_bytes
     ## @return     nothing
     ##
-    def _create_send_buffer(self, lenght, d1, d2):
-        self.s_buf = bytearray(lenght*2)
-        for i in range(lenght):
-            self.s_buf[2*i] = d1
-            self.s_buf[(2*i)+1] = d2
-        self._send_data(self.s_buf)
-        self.s_buf = None
-    
+    def _fill_pixels(self, npix, color):
+        if self._depth == 12:
+            # 3 bytes every 2 pixels, an odd last pixel is written twice
+            color = self._pack444(color)
+            npix = (npix + 1) >> 1
+        chunk = color * (npix if npix < ST7735_FILL_CHUNK else ST7735_FILL_CHUNK)
+        while npix >= ST7735_FILL_CHUNK:
+            self._write_raw(chunk)
+            npix -= ST7735_FILL_CHUNK
+        if npix > 0:
+            self._write_raw(chunk[:npix*len(color)])
+
+    ##
+    ## @brief      Set the pixel address window and start the memory write, leaving the transaction open.
     ##
-    ## @brief      Set the pixel address window for proceeding drawing commands.
+    ##             CS stays asserted and DC is left high: the pixel data can be written right away
+    ##             with _write_raw, then the transaction must be closed with _end_txn.
     ##
     ## @param      self
     ## @param      x0  is the minimum x pixel bound
@@ -468,24 +590,173 @@ class ST7735(spi.Spi):
     ## @param      y1  is the maximum y pixel bound
     ## @return     nothing
     ##
-    def _prepare(self, x0=0, y0=0, x1=0, y1=0):
+    def _prepare_keep_open(self, x0=0, y0=0, x1=0, y1=0):
 
         x0 += self.colstart
         x1 += self.colstart
         y0 += self.rowstart
         y1 += self.rowstart
 
-        self._command(ST7735_CASET) # Coloumn addr set
-        self._data(x0 >> 8)
-        self._data(x0) # XSTART
-        self._data(x1 >> 8)
-        self._data(x1) # XEND
-        self._command(ST7735_RASET) # Row addr set
-        self._data(y0 >> 8)
-        self._data(y0) # YSTART
-        self._data(y1 >> 8)
-        self._data(y1) # YEND
-        self._command(ST7735_RAMWR)  
+        self._begin_txn(data=False)
+        self.buf[0] = ST7735_CASET # Coloumn addr set
+        self._write_raw(self.buf)
+        self._begin_data()
+        self._win_buf[0] = x0 >> 8
+        self._win_buf[1] = x0 & 0xFF # XSTART
+        self._win_buf[2] = x1 >> 8
+        self._win_buf[3] = x1 & 0xFF # XEND
+        self._write_raw(self._win_buf)
+        self._begin_command()
+        self.buf[0] = ST7735_RASET # Row addr set
+        self._write_raw(self.buf)
+        self._begin_data()
+        self._win_buf[0] = y0 >> 8
+        self._win_buf[1] = y0 & 0xFF # YSTART
+        self._win_buf[2] = y1 >> 8
+        self._win_buf[3] = y1 & 0xFF # YEND
+        self._write_raw(self._win_buf)
+        self._begin_command()
+        self.buf[0] = ST7735_RAMWR
+        self._write_raw(self.buf)
+        self._begin_data()
+
+    ##
+    ## @brief      Fill a rectangular area of the framebuffer with a color.
+    ##
+    ## @param      self
+    ## @param      x       is the x-coordinate of the area
+    ## @param      y       is the y-coordinate of the area
+    ## @param      w       is the width of the area, already clipped to the display
+    ## @param      h       is the height of the area, already clipped to the display
+    ## @param      color   is the color as returned by _color_bytes
+    ## @return     nothing
+    ##
+    def _fb_fill(self, x, y, w, h, color):
+        self._mark_dirty(x, y, w, h)
+        row = color * w
+        row_len = w*2
+        stride = self.width*2
+        pos = (y*self.width + x)*2
+        for i in range(h):
+            self._fb[pos:pos+row_len] = row
+            pos += stride
+
+    ##
+    ## @brief      Copy a buffer of w*h pixels into the framebuffer, clipping it to the display.
+    ##
+    ## @param      self
+    ## @param      x       is the x-coordinate of the area
+    ## @param      y       is the y-coordinate of the area
+    ## @param      w       is the width of the buffer in pixels
+    ## @param      h       is the height of the buffer in pixels
+    ## @param      buf     is the buffer with the pixels to copy
+    ## @return     nothing
+    ##
+    def _fb_blit(self, x, y, w, h, buf):
+        vis_w = w if (x + w) <= self.width else self.width - x
+        vis_h = h if (y + h) <= self.height else self.height - y
+        if vis_w < 1 or vis_h < 1:
+            return
+        self._mark_dirty(x, y, vis_w, vis_h)
+        row_len = vis_w*2
+        stride = self.width*2
+        pos = (y*self.width + x)*2
+        src = 0
+        for i in range(vis_h):
+            self._fb[pos:pos+row_len] = buf[src:src+row_len]
+            pos += stride
+            src += w*2
+
+    ##
+    ## @brief      Expand the dirty area of the framebuffer to include a rectangle.
+    ##
+    ## @param      self
+    ## @param      x       is the x-coordinate of the rectangle
+    ## @param      y       is the y-coordinate of the rectangle
+    ## @param      w       is the width of the rectangle
+    ## @param      h       is the height of the rectangle
+    ## @return     nothing
+    ##
+    def _mark_dirty(self, x, y, w, h):
+        x1 = x + w - 1
+        y1 = y + h - 1
+        if self._dirty is None:
+            self._dirty = [x, y, x1, y1]
+            return
+        if x < self._dirty[0]:
+            self._dirty[0] = x
+        if y < self._dirty[1]:
+            self._dirty[1] = y
+        if x1 > self._dirty[2]:
+            self._dirty[2] = x1
+        if y1 > self._dirty[3]:
+            self._dirty[3] = y1
+
+    ##
+    ## @brief      Send a rectangular area of the framebuffer to the display.
+    ##
+    ## @param      self
+    ## @param      x       is the x-coordinate of the area
+    ## @param      y       is the y-coordinate of the area
+    ## @param      w       is the width of the area, already clipped to the display
+    ## @param      h       is the height of the area, already clipped to the display
+    ## @return     nothing
+    ##
+    def _send_fb_rect(self, x, y, w, h):
+        self._set_depth(16)
+        self._prepare_keep_open(x, y, x + w - 1, y + h - 1)
+        if w == self.width and h == self.height:
+            self._write_raw(self._fb)
+            self._end_txn()
+            return
+        row_len = w*2
+        stride = self.width*2
+        pos = (y*self.width + x)*2
+        rows = 1
+        if w == self.width:
+            # full rows are contiguous in the framebuffer: send them in blocks
+            rows = (ST7735_FILL_CHUNK*2) // row_len
+            if rows < 1:
+                rows = 1
+        while h > 0:
+            n = rows if rows < h else h
+            self._write_raw(self._fb[pos:pos+(n*row_len)])
+            pos += n*stride
+            h -= n
+        self._end_txn()
+
+    def show(self):
+        """
+    .. method:: show()
+
+        Sends to the display the area of the framebuffer modified since the last call. Only available in framebuffer mode.
+
+        """
+        if self._fb is None:
+            raise ValueError
+        if self._dirty is None:
+            return
+        x0, y0, x1, y1 = self._dirty
+        self._send_fb_rect(x0, y0, x1 - x0 + 1, y1 - y0 + 1)
+        self._dirty = None
+
+    def show_rect(self, x, y, w, h):
+        """
+    .. method:: show_rect(x, y, w, h)
+
+        :param x: x-coordinate for left high corner of the rectangular area.
+        :param y: y-coordinate for left high corner of the rectangular area.
+        :param w: width of the rectangular area.
+        :param h: height of the rectangular area.
+
+        Sends only a rectangular area of the framebuffer to the display. Only available in framebuffer mode.
+
+        """
+        if self._fb is None:
+            raise ValueError
+
+        x, y, w, h = self._clamp(x, y, w, h)
+        self._send_fb_rect(x, y, w, h)
 
     def clear(self):
         """
@@ -500,14 +771,11 @@ class ST7735(spi.Spi):
         """
     .. method:: fill_screen(color)
 
-        :param color: is a list composed by RGB color.
+        :param color: is a list or tuple composed by RGB color, or 2 bytes in RGB565 format.
 
         Fills the entire display with RGB color provided as argument.
 
         """
-        if (type(color) != PLIST):
-            raise ValueError
-        
         self.fill_rect(0, 0, self.width, self.height, color)
 
     def fill_rect(self, x, y, w, h, color):
@@ -518,36 +786,21 @@ class ST7735(spi.Spi):
         :param y: y-coordinate for left high corner of the rectangular area.
         :param w: width of the rectangular area.
         :param h: height of the rectangular area.
-        :param color: is a list composed by RGB color for the rectangular area.
+        :param color: is a list or tuple composed by RGB color, or 2 bytes in RGB565 format, for the rectangular area.
 
         Draws a rectangular area in the screen colored with the RGB color provided as argument.
 
         """
-        if (x > self.width or y > self.height):
-            raise ValueError
-
-        if (w < 1) or (h < 1) or (x < 0) or (y < 0):
-            raise ValueError
-
-        if type(color) != PLIST:
-            raise ValueError
-        
-        # check if coordinates are in the border of the display
-        if (x == self.width):
-            x = self.width - 1
-        if (y == self.height):
-            y = self.height - 1
-
-        # check if rect goes out of the display
-        if (x + w) > self.width:
-            w = self.width - x
-        if (y + h) > self.height:
-            h = self.height - y
-
-        self._prepare(x, y, x + w - 1, y + h - 1)
-        d1, d2 = self._set_color(color)
-        lenght = w*h
-        self._create_send_buffer(lenght, d1, d2)
+        x, y, w, h = self._clamp(x, y, w, h)
+        color = self._validate_color(color)
+
+        if self._fb is not None:
+            self._fb_fill(x, y, w, h, color)
+            return
+        self._set_depth(self.color_depth)
+        self._prepare_keep_open(x, y, x + w - 1, y + h - 1)
+        self._fill_pixels(w*h, color)
+        self._end_txn()
     
     def draw_pixel(self, x, y, color):
         """
@@ -555,74 +808,67 @@ class ST7735(spi.Spi):
 
         :param x: pixel x-coordinate.
         :param y: pixel y-coordinate.
-        :param color: is a list composed by RGB color.
+        :param color: is a list or tuple composed by RGB color, or 2 bytes in RGB565 format.
 
         Draws a single pixel in the screen colored with the RGB color provided as argument.
 
         """
-        if (x > self.width or y > self.height):
-            raise ValueError
-
-        if (x < 0 or y < 0):
-            raise ValueError
-        
-        if type(color) != PLIST:
-            raise ValueError
-        
-        # check if coordinates are in the border of the display
-        if (x == self.width):
-            x = self.width - 1
-        if (y == self.height):
-            y = self.height - 1
-
-        self._prepare(x, y, 1, 1)
-        d1, d2 = self._set_color(color)
-        self._send_data(bytearray([d1,d2]))
+        x, y, w, h = self._clamp(x, y, 1, 1)
+        color = self._validate_color(color)
+
+        if self._fb is not None:
+            pos = (y*self.width + x)*2
+            self._fb[pos] = color[0]
+            self._fb[pos+1] = color[1]
+            self._mark_dirty(x, y, 1, 1)
+            return
+        self._set_depth(self.color_depth)
+        if self._depth == 12:
+            # 4-4-4 pixel, the last nibble is ignored
+            c = (color[0] << 8) | color[1]
+            self._px[0] = ((c >> 8) & 0xF0) | ((c >> 7) & 0x0F)
+            self._px[1] = (c << 3) & 0xF0
+        else:
+            self._px[0] = color[0]
+            self._px[1] = color[1]
+        self._prepare_keep_open(x, y, x, y)
+        self._write_raw(self._px)
+        self._end_txn()
     
-    def draw_line(self, x, y, lenght, color):
+    def draw_line(self, x, y, length, color):
         """
-    .. method:: draw_line(x, y, lenght, color)
+    .. method:: draw_line(x, y, length, color)
 
         :param x: pixel x-coordinate.
         :param y: pixel y-coordinate.
-        :param lenght: is the lenght of line.
-        :param color: is a list composed by RGB color.
+        :param length: is the length of line, clipped to the display border.
+        :param color: is a list or tuple composed by RGB color, or 2 bytes in RGB565 format.
 
         Draws a line in the screen colored with the RGB color provided as argument.
 
         """
-        if (x > self.width or y > self.height):
-            raise ValueError
-
-        if (x < 0 or y < 0 or lenght < 1):
-            raise ValueError
-            
-        if type(color) != PLIST:
-            raise ValueError
-    
-        # check if coordinates are in the border of the display
-        if (x == self.width):
-            x = self.width - 1
-        if (y == self.height):
-            y = self.height - 1
-        
-        # check if line goes out of the display
-        if (x + lenght) > self.width:
-            w = self.width - x
-
-        d1, d2 = self._set_color(color)
-        self._prepare(x, y, x+lenght-1, y)
-        self._create_send_buffer(lenght, d1, d2)
+        # length is clipped so that no pixel past the display edge is sent
+        x, y, length, h = self._clamp(x, y, length, 1)
+        color = self._validate_color(color)
+
+        if self._fb is not None:
+            self._fb_fill(x, y, length, 1, color)
+            return
+        self._set_depth(self.color_depth)
+        self._prepare_keep_open(x, y, x+length-1, y)
+        self._fill_pixels(length, color)
+        self._end_txn()
     
-    def draw_img(self, image, x=0, y=0, w=80, h=80):
+    def draw_img(self, image, x=0, y=0, w=80, h=80, pixel_format=16):
         """
-    .. method:: draw_img(image, x=0, y=0, w=80, h=80)
+    .. method:: draw_img(image, x=0, y=0, w=80, h=80, pixel_format=16)
 
         :param image: image to draw in the display converted to hex array format and passed as bytearray.
         :param x: x-coordinate for left high corner of the image (default value is 0).
         :param y: y-coordinate for left high corner of the image (default value is 0).
         :param w: width of the image (default value is 80).
         :param h: height of the image (default value is 80).
+        :param pixel_format: bits per pixel of the image, 16 (RGB565) or 12 (two RGB444 pixels every 3 bytes). 12-bit images can't be drawn in framebuffer mode (default value is 16).
 
         Draws the image passed in bytearray format as argument.
 
@@ -635,14 +881,22 @@ class ST7735(spi.Spi):
         """
         if type(image) != PBYTEARRAY:
             raise ValueError
-        
-        if (x > self.width or y > self.height):
-            raise ValueError
 
-        if (x < 0 or y < 0 or w < 1 or h < 1):
+        if pixel_format not in [12, 16] or (pixel_format == 12 and self._fb is not None):
             raise ValueError
-        self._prepare(x, y, x+w-1, y+h-1)
-        self._send_data(image)
+
+        # the image rows are w pixels long, so the area is only checked, not clipped
+        self._clamp(x, y, w, h)
+        if self._fb is not None:
+            # a short image would shrink the framebuffer when its rows are copied
+            if len(image) < w*h*2:
+                raise ValueError
+            self._fb_blit(x, y, w, h, image)
+            return
+        self._set_depth(pixel_format)
+        self._prepare_keep_open(x, y, x+w-1, y+h-1)
+        self._write_raw(image)
+        self._end_txn()
     
     ##
     ## @brief      Set the font of text.
@@ -654,14 +908,25 @@ class ST7735(spi.Spi):
     ##
     def _set_font(self, font=None, font_color=None):
         try:
-            if font != None:
+            if font != None and font is not self.font:
+                self._clear_glyph_cache()
                 self.font = font
+                self._font_bytes = None
                 self.first_char = font[2] | font[3] << 8
                 self.last_char = font[4] | font[5] << 8
                 self.font_height = font[6]
+                # glyph width and bitmap offset, read once from the glyph table
+                n_chars = self.last_char - self.first_char + 1
+                self._glyph_w = bytearray(n_chars)
+                self._glyph_off = [0]*n_chars
+                idx = 8
+                for i in range(n_chars):
+                    self._glyph_w[i] = font[idx]
+                    self._glyph_off[i] = font[idx+1] | (font[idx+2] << 8) | (font[idx+3] << 16)
+                    idx += 4
             if font_color == None:
                 font_color = [255, 255, 255]
-            self.font_color = self._set_color(font_color)
+            self.font_color = self._color_bytes(font_color)
         except Exception as e:
             print("font not recognized:", e)
 
@@ -679,7 +944,17 @@ class ST7735(spi.Spi):
         self.align = align
         if (background == None):
             background = [0, 0, 0]
-        self.background = self._set_color(background)
+        self.background = self._color_bytes(background)
+
+    ##
+    ## @brief      Drop all the rendered glyphs.
+    ##
+    ## @param      self
+    ## @return     nothing
+    ##
+    def _clear_glyph_cache(self):
+        self._glyph_cache = {}
+        self._glyph_lru = []
 
     ##
     ## @brief      Get the text width.
@@ -690,11 +965,11 @@ class ST7735(spi.Spi):
     ##
     def _get_text_width(self, text):
         t_width = 0
+        glyph_w = self._glyph_w
+        first_char = self.first_char
         for c in text:
-            index = 8 + ((ord(c) - self.first_char) << 2)
-            t_width += self.font[index]
             # insert 1 px for space
-            t_width += 1
+            t_width += glyph_w[ord(c) - first_char] + 1
         # remove last space
         t_width -= 1
         return t_width
@@ -727,11 +1002,8 @@ class ST7735(spi.Spi):
         # write the characters into designated space, one by one
         self._create_text_background()
         for c in text:
-            c_width = self._write_c_to_buf(c)
-            idx = ((y*self.dynamic_area["width"]*2) + x*2)#+OLED_COLUMN_OFFSET
-            self._add_char_to_dynamic_area(idx, c_width)
+            c_width = self._blit_char(c, x, y)
             x += c_width + 1
-            self.c_buf = None
 
     ##
     ## @brief      Create the text background.
@@ -740,66 +1012,107 @@ class ST7735(spi.Spi):
     ## @return     nothing
     ##
     def _create_text_background(self):
-        count = 0
         area = self.dynamic_area["width"]*self.dynamic_area["height"]
-        self.dynamic_area["buffer"] = bytearray(area*2)
-        while count < area:
-            self.dynamic_area["buffer"][2*count] = self.background[0]
-            self.dynamic_area["buffer"][(2*count) + 1] = self.background[1]
-            count +=1
+        self.dynamic_area["buffer"] = bytearray(self.background * area)
 
     ##
-    ## @brief      Add char to dynamic area.
+    ## @brief      Build the lookup table expanding a font byte into 8 colored pixels.
     ##
     ## @param      self
-    ## @param      idx 
-    ## @param      c_width
-    ## @param      c_height
     ## @return     nothing
     ##
-    def _add_char_to_dynamic_area(self, idx, c_width, c_height):
-        x_count = 0
-        for b in self.c_buf:
-            self.dynamic_area["buffer"][idx] = b
-            x_count += 1
-            if x_count == c_width*2:
-                x_count = 0
-                idx += (self.dynamic_area["width"]-c_width)*2
-            idx += 1
+    def _build_expand(self):
+        colors = self.font_color + self.background
+        if self._expand_colors == colors:
+            return
+        fg = self.font_color
+        bg = self.background
+        # 4 pixels for each nibble, least significant bit is the leftmost pixel
+        nibbles = []
+        for n in range(16):
+            nib = bytearray(8)
+            for bit in range(4):
+                nib[bit*2:(bit*2)+2] = fg if (n & (1 << bit)) else bg
+            nibbles.append(bytes(nib))
+        self._expand = []
+        for b in range(256):
+            self._expand.append(nibbles[b & 0x0F] + nibbles[b >> 4])
+        self._expand_colors = colors
 
     ##
-    ## @brief      Add elements to buffer for dynamic area.
+    ## @brief      Render a char in its own buffer with the Python rasterizer.
     ##
     ## @param      self
-    ## @param      c
-    ## @return     nothing
+    ## @param      c   is the char to render
+    ## @return     a bytearray with the char pixels, row by row
     ##
-    def _write_c_to_buf(self, c):
-        idx = 8 + ((ord(c) - self.first_char) << 2)
-        c_width = self.font[idx]
-        offset = self.font[idx+1] | (self.font[idx+2] << 8) | (self.font[idx+3] << 16)
-        area = self.font_height*c_width
-        self.c_buf = bytearray(area*2)
-        cnt = 0
-        x_count = 0
-        while cnt < area:
-            if x_count == 0:
-                mask = 1
-                byte = self.font[offset]
-            if (byte & mask) != 0:
-                self.c_buf[cnt*2] = self.font_color[0]
-                self.c_buf[(cnt*2) + 1] = self.font_color[1]
-            else:
-                self.c_buf[cnt*2] = self.background[0]
-                self.c_buf[(cnt*2) + 1] = self.background[1]
-            mask = mask << 1
-            cnt += 1
-            x_count += 1
-            if x_count == c_width:
-                x_count = 0
+    def _render_char(self, c):
+        i = ord(c) - self.first_char
+        c_width = self._glyph_w[i]
+        offset = self._glyph_off[i]
+        row_len = c_width*2
+        glyph = bytearray(row_len*self.font_height)
+        self._build_expand()
+        expand = self._expand
+        pos = 0
+        for row in range(self.font_height):
+            # each row is stored in (c_width + 7) >> 3 bytes, 8 pixels per byte
+            left = row_len
+            while left > 0:
+                pixels = expand[self.font[offset]]
+                if left < 16:
+                    pixels = pixels[:left]
+                glyph[pos:pos+len(pixels)] = pixels
+                pos += len(pixels)
+                left -= len(pixels)
                 offset += 1
+        return glyph
+
+    ##
+    ## @brief      Draw a char into the dynamic area buffer.
+    ##
+    ##             The C rasterizer writes the char in place; the Python one renders it
+    ##             once per colors and reuses it from the glyph cache.
+    ##
+    ## @param      self
+    ## @param      c   is the char to draw
+    ## @param      x   is the x-coordinate of the char inside the dynamic area
+    ## @param      y   is the y-coordinate of the char inside the dynamic area
+    ## @return     the width of the char
+    ##
+    def _blit_char(self, c, x, y):
+        i = ord(c) - self.first_char
+        c_width = self._glyph_w[i]
+        dst = self.dynamic_area["buffer"]
+        stride = self.dynamic_area["width"]*2
+        if self._native_glyphs:
+            if self._font_bytes is None:
+                # the C rasterizer reads the glyphs from a bytes copy of the font
+                self._font_bytes = bytes(self.font)
+            _blit_glyph(self._font_bytes, self._glyph_off[i], c_width, self.font_height,
+                        self.font_color[0], self.font_color[1], self.background[0], self.background[1],
+                        dst, stride, x, y)
+            return c_width
+
+        key = (c, self.font_color, self.background)
+        glyph = self._glyph_cache.get(key)
+        if glyph is None:
+            glyph = self._render_char(c)
+            if len(self._glyph_lru) >= ST7735_GLYPH_CACHE:
+                del self._glyph_cache[self._glyph_lru.pop(0)]
+            self._glyph_cache[key] = glyph
+        else:
+            self._glyph_lru.remove(key)
+        self._glyph_lru.append(key)
+
+        row_len = c_width*2
+        pos = (y*stride) + x*2
+        src = 0
+        for row in range(self.font_height):
+            dst[pos:pos+row_len] = glyph[src:src+row_len]
+            pos += stride
+            src += row_len
         return c_width
-        
 
     def draw_text(self, text, x=0, y=0, w=None, h=None, font_text=None, font_color=None, align=3, background=None):
         """
@@ -836,21 +1149,18 @@ class ST7735(spi.Spi):
 
         Prints a string inside a text box in the screen.
         """
-        if (x > self.width or y > self.height):
-            raise ValueError
-        
-        if (x < 0 or y < 0):
-            raise ValueError
-
-        if (w != None and w < 1) or (h != None and h < 1):
-            raise ValueError
+        # the text box is only checked, it's resized later to fit the text
+        self._clamp(x, y, 1 if w is None else w, 1 if h is None else h)
+        if font_color != None:
+            font_color = self._validate_color(font_color)
+        if background != None:
+            background = self._validate_color(background)
 
-        if (font_color != None and type(font_color) != PLIST) or (background != None and type(background) != PLIST):
-            raise ValueError
-        
         if (font_text == None):
-            from sitronix.st7735 import fonts
-            font_text = fonts.guiFont_Tahoma_7_Regular
+            if self._default_font is None:
+                from sitronix.st7735 import fonts
+                self._default_font = fonts.guiFont_Tahoma_7_Regular
+            font_text = self._default_font
         self._set_font(font=font_text, font_color=font_color)
         self._set_text_prop(align=align, background=background)
        
@@ -865,6 +1175,11 @@ class ST7735(spi.Spi):
         self.dynamic_area["width"] = w
         self.dynamic_area["height"] = h
         self._add_text(text)
-        self._prepare(self.dynamic_area["x"], self.dynamic_area["y"], self.dynamic_area["x"]+self.dynamic_area["width"]-1, self.dynamic_area["y"]+self.dynamic_area["height"]-1)
-        self._send_data(self.dynamic_area["buffer"])
+        if self._fb is not None:
+            self._fb_blit(self.dynamic_area["x"], self.dynamic_area["y"], self.dynamic_area["width"], self.dynamic_area["height"], self.dynamic_area["buffer"])
+        else:
+            self._set_depth(16)
+            self._prepare_keep_open(self.dynamic_area["x"], self.dynamic_area["y"], self.dynamic_area["x"]+self.dynamic_area["width"]-1, self.dynamic_area["y"]+self.dynamic_area["height"]-1)
+            self._write_raw(self.dynamic_area["buffer"])
+            self._end_txn()
         self.dynamic_area["buffer"] = None